@@ -1,180 +1,18 @@
 #!/usr/bin/env python3
 
-# from flask import Flask, request
-# from flask_migrate import Migrate
-# from flask_restful import Api, Resource
-# from sqlalchemy import select
-# from marshmallow import Schema, fields, ValidationError
-# from werkzeug.exceptions import (
-#     NotFound,
-#     BadRequest,
-#     Unauthorized,
-#     Forbidden,
-#     InternalServerError,
-# )
-
-# from models import db, Plant
-
-# # Create a new Flask application
-# app = Flask(__name__)
-# # Configure the application to use a SQLite database
-# app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///plants.db"
-# # Disable SQLAlchemy's event system, which is not needed in this application
-# app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-# # Configure the application to use compact JSON
-# app.json.compact = False
-# # Initialize Flask-Migrate, which handles database migrations
-# migrate = Migrate(app, db)
-# # Initialize SQLAlchemy with the Flask application
-# db.init_app(app)
-# # Create a new Flask-RESTful API with the Flask application
-# api = Api(app)
-
-
-# # Define a schema for Plant objects using Marshmallow
-# class PlantSchema(Schema):
-#     id = fields.Int(
-#         dump_only=True
-#     )  # ID field, which is not required when creating a new plant
-#     name = fields.Str(required=True)  # Name field, which is required
-#     image = fields.Str(required=True)  # Image field, which is required
-#     price = fields.Float(required=True)  # Price field, which is required
-#     is_in_stock = fields.Bool(required=True)  # Is_in_stock field, which is required
-
-
-# # Create an instance of PlantSchema
-# plant_schema = PlantSchema()
-
-
-# # Define a decorator function for handling errors
-# def handle_errors(func):
-#     def wrapper(*args, **kwargs):
-#         try:
-#             # Call the decorated function and return its result
-#             return func(*args, **kwargs)
-#         except NotFound as e:
-#             return {"error": e.description}, 404
-#         except ValidationError as e:
-#             db.session.rollback()
-#             return {"message": e.messages}, 422
-#         except BadRequest as e:
-#             return {"error": e.description}, 400
-#         except Unauthorized as e:
-#             return {"error": e.description}, 401
-#         except Forbidden as e:
-#             return {"error": e.description}, 403
-#         except InternalServerError as e:
-#             return {"error": "Internal server error"}, 500
-#         except Exception as e:
-#             db.session.rollback()
-#             return {"message": str(e)}, 422
-
-#     return wrapper
-
-
-# class Plants(Resource):
-
-#     #!#!#!
-#     @handle_errors
-#     def get(self):
-#         # Execute a select query to get all plants
-#         result = db.session.execute(select(Plant))
-#         # Fetch all plants from the result
-#         plants = result.scalars().all()
-#         # If no plants were found, return an error message
-#         if not plants:
-#             return {"message": "Plant not found"}, 404
-#         # Otherwise, return the plants
-#         return plant_schema.dump(plants, many=True), 200
-
-#     @handle_errors
-#     def post(self):
-#         # Get the request data, which can be form data or JSON data
-#         data = request.get_json() if request.is_json else request.form
-#         # Validate and deserialize the data
-#         data = plant_schema.load(data)
-#         # Create a new plant with the data
-#         new_plant = Plant(**data)
-#         # Add the new plant to the session
-#         db.session.add(new_plant)
-#         # Commit the session to save the new plant
-#         db.session.commit()
-#         # Return the new plant
-#         return plant_schema.dump(new_plant), 201
-
-
-# api.add_resource(Plants, "/plants")
-
-
-# class PlantByID(Resource):
-
-#     def get_plant_by_id(self, id):
-#         # Execute a select query to get the plant with the given ID
-#         stmt = select(Plant).where(Plant.id == id)
-#         result = db.session.execute(stmt)
-#         # Fetch the first plant from the result
-#         plant = result.scalars().first()
-#         # If no plant was found, return None
-#         if plant is None:
-#             return None
-#         # Otherwise, return the plant
-#         return plant
-
-#     @handle_errors
-#     def get(self, id):
-#         # Get the plant with the given ID
-#         plant = self.get_plant_by_id(id)
-#         # If no plant was found, return an error message
-#         if plant is None:
-#             return {"message": "Plant not found"}, 404
-#         # Otherwise, return the plant
-#         return plant_schema.dump(plant), 200
-
-#     @handle_errors
-#     def patch(self, id):
-#         # Get the plant with the given ID
-#         plant = self.get_plant_by_id(id)
-#         # If no plant was found, return an error message
-#         if plant is None:
-#             return {"message": "Plant not found"}, 404
-#         # Get the request data, which can be form data or JSON data
-#         data = request.get_json() if request.is_json else request.form
-#         # Validate and deserialize the data
-#         data = plant_schema.load(data, partial=True)
-#         # Update the plant with the data
-#         for key, value in data.items():
-#             setattr(plant, key, value)
-#         # Commit the session to save the changes
-#         db.session.commit()
-#         # Return the updated plant
-#         return plant_schema.dump(plant), 200
-
-#     @handle_errors
-#     def delete(self, id):
-#         # Get the plant with the given ID
-#         plant = self.get_plant_by_id(id)
-#         # If no plant was found, return an error message
-#         if plant is None:
-#             return {"message": "Plant not found"}, 404
-#         # Delete the plant
-#         db.session.delete(plant)
-#         # Commit the session to save the changes
-#         db.session.commit()
-#         # Return no content
-#         return "", 204
-
-
-# api.add_resource(PlantByID, "/plants/<int:id>")
-
-
-# if __name__ == "__main__":
-#     app.run(port=5555, debug=True)
-
-from flask import Flask, request
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
+from flask import Flask, Response, request, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+from flask_compress import Compress
 from flask_migrate import Migrate
-from flask_restful import Api, Resource
-from sqlalchemy import select
+from sqlalchemy import bindparam, delete, event, insert, lambda_stmt, select, update
+from sqlalchemy.orm import raiseload
 from werkzeug.exceptions import (
+    HTTPException,
     NotFound,
     BadRequest,
     Unauthorized,
@@ -184,20 +22,183 @@ from werkzeug.exceptions import (
 
 from models import db, Plant
 
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider that serializes with orjson instead of stdlib json."""
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.compact is False:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///plants.db"
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-app.json.compact = False
+# Grow SQLAlchemy's compiled-statement cache beyond the 500 default,
+# and size the connection pool for the gevent workers started from
+# wsgi.py, where each green thread checks out its own connection.
+app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+    "query_cache_size": 1200,
+    "pool_size": 10,
+    "max_overflow": 20,
+}
+# Compact JSON on the wire; pretty-printing only bloats payloads.
+app.json.compact = True
+# Compress JSON responses over 500 bytes when the client accepts
+# brotli or gzip; the list endpoint is repetitive text that shrinks
+# roughly 10x. Note: the locked flask-compress 1.15 compresses a
+# streamed response by buffering the whole body first, so clients
+# that send Accept-Encoding trade the list endpoint's
+# time-to-first-byte for the smaller payload; clients that don't
+# still get the row-by-row stream.
+app.config["COMPRESS_MIMETYPES"] = ["application/json"]
+app.config["COMPRESS_LEVEL"] = 4
+app.config["COMPRESS_MIN_SIZE"] = 500
+app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+Compress(app)
 migrate = Migrate(app, db)
 db.init_app(app)
-api = Api(app)
+
+with app.app_context():
+
+    @event.listens_for(db.engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        # WAL lets readers run during writes and turns per-commit
+        # fsyncs into batched WAL appends; NORMAL sync is safe under
+        # WAL. Cache/mmap sizes keep hot pages out of syscalls.
+        cursor = dbapi_connection.cursor()
+        cursor.executescript(
+            "PRAGMA journal_mode=WAL;"
+            "PRAGMA synchronous=NORMAL;"
+            "PRAGMA cache_size=-64000;"
+            "PRAGMA mmap_size=268435456;"
+            "PRAGMA temp_store=MEMORY;"
+        )
+        cursor.close()
+
+
+# In-process TTL cache for GET response bodies, keyed "plants:all"
+# for the default list page and "plants:<id>" for single plants.
+# Writes invalidate the affected keys; entries also expire on their
+# own so a second process (e.g. another gunicorn worker) can only
+# serve stale data for at most _CACHE_TTL seconds. The generation
+# counter lets a streaming response detect that a write landed while
+# it was still being generated, in which case its (pre-write) body
+# must not be cached -- nothing would be left to invalidate it.
+_CACHE_TTL = 60
+_response_cache = {}
+_cache_generation = 0
+
+
+def _cache_get(key):
+    entry = _response_cache.get(key)
+    if entry is None:
+        return None
+    expires, body = entry
+    if time.monotonic() >= expires:
+        _response_cache.pop(key, None)
+        return None
+    return body
+
+
+def _cache_set(key, body):
+    _response_cache[key] = (time.monotonic() + _CACHE_TTL, body)
+
+
+def _cache_invalidate(*keys):
+    global _cache_generation
+    _cache_generation += 1
+    for key in keys:
+        _response_cache.pop(key, None)
+
+
+def _etag_matches(etag):
+    # flask-compress rewrites the validator on compressed responses
+    # to "<etag>:<algorithm>" and the client echoes that back, so
+    # compare with any algorithm suffix stripped.
+    return any(
+        tag.split(":", 1)[0] == etag
+        for tag in request.if_none_match.as_set(include_weak=True)
+    )
+
+
+def _conditional_response(body):
+    # Strong ETag over the cached bytes; a matching If-None-Match
+    # gets an empty 304 instead of the full payload.
+    etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+    if _etag_matches(etag):
+        response = Response(status=304)
+    else:
+        response = Response(
+            body, status=200, mimetype="application/json", direct_passthrough=True
+        )
+    response.set_etag(etag)
+    return response
+
+
+def _payload():
+    # get_json(silent=True) returns None for non-JSON bodies without
+    # re-parsing the Content-Type header the way a request.is_json
+    # branch would. Only None falls back to form data: an empty JSON
+    # array/object is falsy but still a JSON payload.
+    data = request.get_json(silent=True)
+    return request.form if data is None else data
+
+
+# orjson releases the GIL while encoding, so pushing large dumps onto
+# a native thread lets the worker accept the next request while the
+# encode runs. Small payloads stay inline; the submit/result handoff
+# costs more than they take to encode.
+_JSON_POOL = ThreadPoolExecutor(max_workers=2)
+_OFFLOAD_MIN_ITEMS = 1000
+
+
+def _dumps(payload):
+    if isinstance(payload, list) and len(payload) >= _OFFLOAD_MIN_ITEMS:
+        try:
+            from gevent import monkey
+        except ImportError:
+            monkey = None
+        if monkey is not None and monkey.is_module_patched("threading"):
+            # Under the wsgi.py deployment monkey.patch_all() turns
+            # ThreadPoolExecutor workers into greenlets on this same
+            # OS thread, which would leave the encode blocking the
+            # hub; gevent's own threadpool still uses real threads.
+            from gevent import get_hub
+
+            return get_hub().threadpool.apply(orjson.dumps, (payload,))
+        return _JSON_POOL.submit(orjson.dumps, payload).result()
+    return orjson.dumps(payload)
+
+
+def _json_response(payload, status=200):
+    # orjson already produced bytes; direct_passthrough hands them to
+    # the WSGI layer as-is instead of re-encoding a str body.
+    return Response(
+        _dumps(payload),
+        status=status,
+        mimetype="application/json",
+        direct_passthrough=True,
+    )
+
+
+_REQUIRED_FIELDS = frozenset(("name", "image", "price", "is_in_stock"))
 
 
 def validate_plant(data):
-    required_fields = ["name", "image", "price", "is_in_stock"]
-    if not all(field in data for field in required_fields):
-        raise BadRequest("Missing required field")
-    return data
+    # One C-level set difference instead of a per-field membership
+    # loop, and the error names exactly what is missing.
+    missing = _REQUIRED_FIELDS.difference(data)
+    if missing:
+        raise BadRequest(f"Missing required field(s): {', '.join(sorted(missing))}")
+    # Coerce form MultiDicts to a plain dict once up front.
+    return dict(data)
 
 
 def plant_to_dict(plant):
@@ -210,85 +211,195 @@ def plant_to_dict(plant):
     }
 
 
-def handle_errors(func):
-    def wrapper(*args, **kwargs):
-        try:
-            return func(*args, **kwargs)
-        except NotFound as e:
-            return {"error": e.description}, 404
-        except BadRequest as e:
-            return {"error": e.description}, 400
-        except Unauthorized as e:
-            return {"error": e.description}, 401
-        except Forbidden as e:
-            return {"error": e.description}, 403
-        except InternalServerError as e:
-            return {"error": "Internal server error"}, 500
-        except Exception as e:
-            db.session.rollback()
-            return {"message": str(e)}, 422
-
-    return wrapper
-
-
-class Plants(Resource):
-    @handle_errors
-    def get(self):
-        result = db.session.execute(select(Plant))
-        plants = result.scalars().all()
-        if not plants:
-            return {"message": "Plant not found"}, 404
-        return [plant_to_dict(plant) for plant in plants], 200
-
-    @handle_errors
-    def post(self):
-        data = request.get_json() if request.is_json else request.form
-        data = validate_plant(data)
-        new_plant = Plant(**data)
-        db.session.add(new_plant)
+# Status/formatter pairs keyed by exception type: the happy path
+# sets up a single try block, and the error path is one dict lookup
+# instead of walking an except ladder.
+_STATUS_MAP = {
+    NotFound: (404, lambda e: {"error": e.description}),
+    BadRequest: (400, lambda e: {"error": e.description}),
+    Unauthorized: (401, lambda e: {"error": e.description}),
+    Forbidden: (403, lambda e: {"error": e.description}),
+    InternalServerError: (500, lambda e: {"error": "Internal server error"}),
+}
+
+
+# App-level handlers replace the old per-view @handle_errors
+# decorator: views carry no try/except setup at all, and errors are
+# formatted in one place.
+@app.errorhandler(HTTPException)
+def handle_http_exception(e):
+    # Unmapped HTTP errors keep their own status code.
+    code, fmt = _STATUS_MAP.get(
+        type(e), (e.code or 500, lambda x: {"error": x.description})
+    )
+    return fmt(e), code
+
+
+@app.errorhandler(Exception)
+def handle_unexpected_exception(e):
+    db.session.rollback()
+    return {"message": str(e)}, 422
+
+
+# Default and maximum page size for GET /plants.
+DEFAULT_PAGE_SIZE = 200
+
+
+# Read queries either select plain columns (get_plants) or carry
+# raiseload("*") so an accidental lazy load on a future Plant
+# relationship fails loudly instead of fanning out into N+1 queries.
+# If a relationship is meant to be returned, add an explicit
+# selectinload(...) next to the raiseload instead of removing it.
+@app.get("/plants")
+def get_plants():
+    # Keyset pagination (?after_id=&limit=) bounds memory to one
+    # page; rows are streamed so the client sees bytes before the
+    # whole page is serialized.
+    limit = request.args.get("limit", DEFAULT_PAGE_SIZE, type=int)
+    limit = max(1, min(limit, DEFAULT_PAGE_SIZE))
+    after_id = request.args.get("after_id", 0, type=int)
+    # Only the default page is cached; paginated requests go to
+    # the database.
+    cacheable = not request.args
+    generation = _cache_generation
+    if cacheable:
+        cached = _cache_get("plants:all")
+        if cached is not None:
+            return _conditional_response(cached)
+    # Fetch plain column tuples instead of ORM instances: no
+    # identity map, no instrumented attribute lookups per row.
+    result = db.session.execute(
+        select(Plant.id, Plant.name, Plant.image, Plant.price, Plant.is_in_stock)
+        .where(Plant.id > after_id)
+        .order_by(Plant.id)
+        .limit(limit)
+        .execution_options(stream_results=True, yield_per=500)
+    )
+    rows = iter(result.mappings())
+    first_row = next(rows, None)
+    if first_row is None and not after_id:
+        return {"message": "Plant not found"}, 404
+
+    def generate():
+        parts = [b"["]
+        yield b"["
+        if first_row is not None:
+            chunk = orjson.dumps(dict(first_row))
+            parts.append(chunk)
+            yield chunk
+            for row in rows:
+                chunk = b"," + orjson.dumps(dict(row))
+                parts.append(chunk)
+                yield chunk
+        parts.append(b"]")
+        yield b"]"
+        # The first (streamed) response carries no ETag; once the
+        # body is fully generated it is cached and revalidatable --
+        # unless a write invalidated the cache mid-stream, in which
+        # case this body predates the write and must be dropped.
+        if cacheable and generation == _cache_generation:
+            _cache_set("plants:all", b"".join(parts))
+
+    # Serialize with orjson directly, bypassing Flask-RESTful's
+    # stdlib-json output_json re-encode on the hottest path.
+    return Response(
+        stream_with_context(generate()), status=200, mimetype="application/json"
+    )
+
+
+@app.post("/plants")
+def create_plants():
+    data = _payload()
+    # A JSON array becomes one executemany INSERT: one roundtrip
+    # and one commit for the whole batch instead of N of each.
+    if isinstance(data, list):
+        rows = [validate_plant(plant) for plant in data]
+        if not rows:
+            return _json_response([], status=201)
+        created = db.session.execute(
+            insert(Plant).returning(
+                Plant.id, Plant.name, Plant.image, Plant.price, Plant.is_in_stock
+            ),
+            rows,
+        ).mappings().all()
         db.session.commit()
-        return plant_to_dict(new_plant), 201
-
+        _cache_invalidate("plants:all")
+        return _json_response([dict(row) for row in created], status=201)
+    data = validate_plant(data)
+    # Core INSERT ... RETURNING: no instrumented __init__, no
+    # identity-map bookkeeping, and the created row comes back
+    # without a flush-then-refresh cycle.
+    row = db.session.execute(
+        insert(Plant)
+        .values(**data)
+        .returning(
+            Plant.id, Plant.name, Plant.image, Plant.price, Plant.is_in_stock
+        )
+    ).mappings().one()
+    db.session.commit()
+    _cache_invalidate("plants:all")
+    return _json_response(dict(row), status=201)
+
+
+# Compiled once and cached by lambda_stmt; only the id parameter is
+# rebound per call.
+_plant_by_id_stmt = lambda_stmt(
+    lambda: select(Plant).options(raiseload("*")).where(Plant.id == bindparam("id"))
+)
 
-api.add_resource(Plants, "/plants")
 
+def get_plant_by_id(id):
+    return db.session.execute(
+        _plant_by_id_stmt, {"id": id}
+    ).scalar_one_or_none()
 
-class PlantByID(Resource):
-    def get_plant_by_id(self, id):
-        stmt = select(Plant).where(Plant.id == id)
-        result = db.session.execute(stmt)
-        plant = result.scalars().first()
-        return plant
 
-    @handle_errors
-    def get(self, id):
-        plant = self.get_plant_by_id(id)
+@app.get("/plants/<int:id>")
+def get_plant(id):
+    key = f"plants:{id}"
+    cached = _cache_get(key)
+    if cached is None:
+        plant = get_plant_by_id(id)
         if plant is None:
             return {"message": "Plant not found"}, 404
-        return plant_to_dict(plant), 200
-
-    @handle_errors
-    def patch(self, id):
-        plant = self.get_plant_by_id(id)
-        if plant is None:
-            return {"message": "Plant not found"}, 404
-        data = request.get_json() if request.is_json else request.form
-        for key, value in data.items():
-            setattr(plant, key, value)
-        db.session.commit()
-        return plant_to_dict(plant), 200
-
-    @handle_errors
-    def delete(self, id):
-        plant = self.get_plant_by_id(id)
-        if plant is None:
-            return {"message": "Plant not found"}, 404
-        db.session.delete(plant)
-        db.session.commit()
-        return "", 204
-
-
-api.add_resource(PlantByID, "/plants/<int:id>")
+        cached = orjson.dumps(plant_to_dict(plant))
+        _cache_set(key, cached)
+    return _conditional_response(cached)
+
+
+@app.patch("/plants/<int:id>")
+def update_plant(id):
+    data = dict(_payload())
+    if not data:
+        raise BadRequest("No fields to update")
+    unknown = data.keys() - _REQUIRED_FIELDS
+    if unknown:
+        raise BadRequest(f"Unknown field(s): {', '.join(sorted(unknown))}")
+    # One UPDATE ... RETURNING roundtrip instead of SELECT-then-
+    # UPDATE, skipping ORM hydration on the write path.
+    row = db.session.execute(
+        update(Plant)
+        .where(Plant.id == id)
+        .values(**data)
+        .returning(Plant.id, Plant.name, Plant.image, Plant.price, Plant.is_in_stock)
+    ).mappings().first()
+    if row is None:
+        return {"message": "Plant not found"}, 404
+    db.session.commit()
+    _cache_invalidate("plants:all", f"plants:{id}")
+    return _json_response(dict(row))
+
+
+@app.delete("/plants/<int:id>")
+def delete_plant(id):
+    row = db.session.execute(
+        delete(Plant).where(Plant.id == id).returning(Plant.id)
+    ).first()
+    if row is None:
+        return {"message": "Plant not found"}, 404
+    db.session.commit()
+    _cache_invalidate("plants:all", f"plants:{id}")
+    return "", 204
 
 if __name__ == "__main__":
     app.run(port=5555, debug=True)
@@ -1,7 +1,11 @@
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy_serializer import SerializerMixin
 
-db = SQLAlchemy()
+# Flask's app-context scoping already gives each request -- and each
+# gevent greenlet -- its own session and pooled connection. Keeping
+# objects live across commit avoids the implicit re-SELECT that
+# expired attributes would otherwise trigger after every write.
+db = SQLAlchemy(session_options={"expire_on_commit": False})
 
 class Plant(db.Model, SerializerMixin):
     __tablename__ = 'plants'
@@ -6,6 +6,50 @@ from models import db, Plant
 class TestPlant:
     '''Flask application in app.py'''
 
+    def test_plants_get_route_supports_pagination(self):
+        '''returns at most "limit" plants starting after "after_id" at "/plants".'''
+        response = app.test_client().get('/plants?limit=1')
+        data = json.loads(response.data.decode())
+
+        assert(type(data) == list)
+        assert(len(data) == 1)
+
+        next_page = app.test_client().get(f'/plants?limit=1&after_id={data[0]["id"]}')
+        next_data = json.loads(next_page.data.decode())
+
+        assert(all(plant["id"] > data[0]["id"] for plant in next_data))
+
+    def test_plants_post_route_creates_plants_in_bulk(self):
+        '''returns JSON representing each new Plant object when POSTed an array at "/plants".'''
+        response = app.test_client().post(
+            '/plants',
+            json = [
+                {
+                    "name": "Snake Plant",
+                    "image": "./images/snake-plant.jpg",
+                    "price": 19.99,
+                    "is_in_stock": True,
+                },
+                {
+                    "name": "Spider Plant",
+                    "image": "./images/spider-plant.jpg",
+                    "price": 9.99,
+                    "is_in_stock": True,
+                },
+            ]
+        )
+        data = json.loads(response.data.decode())
+
+        assert(response.status_code == 201)
+        assert(type(data) == list)
+        assert(len(data) == 2)
+        assert(all(plant["id"] for plant in data))
+
+        with app.app_context():
+            for plant in data:
+                db.session.delete(Plant.query.filter_by(id=plant["id"]).first())
+            db.session.commit()
+
     def test_plant_by_id_get_route(self):
         '''has a resource available at "/plants/<int:id>".'''
         response = app.test_client().get('/plants/1')
@@ -20,6 +64,51 @@ class TestPlant:
         assert(data["id"])
         assert(data["name"])
 
+    def test_plant_by_id_get_route_revalidates_with_etag(self):
+        '''returns 304 Not Modified at "/plants/<int:id>" when the ETag matches.'''
+        client = app.test_client()
+        response = client.get('/plants/1')
+        etag = response.headers.get('ETag')
+
+        assert(etag)
+
+        revalidation = client.get('/plants/1', headers={'If-None-Match': etag})
+
+        assert(revalidation.status_code == 304)
+        assert(not revalidation.data)
+
+    def test_plant_by_id_get_route_revalidates_compressed_etag(self):
+        '''returns 304 Not Modified for a compressed body when the echoed ETag matches.'''
+        with app.app_context():
+            big = Plant(
+                name="Wollemi Pine " + "x" * 600,
+                image="./images/wollemi-pine.jpg",
+                price=149.99,
+                is_in_stock=True,
+            )
+            db.session.add(big)
+            db.session.commit()
+            big_id = big.id
+
+        client = app.test_client()
+        response = client.get(f'/plants/{big_id}', headers={'Accept-Encoding': 'gzip'})
+        etag = response.headers.get('ETag')
+
+        assert(response.headers.get('Content-Encoding') == 'gzip')
+        assert(etag)
+
+        revalidation = client.get(
+            f'/plants/{big_id}',
+            headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag},
+        )
+
+        assert(revalidation.status_code == 304)
+        assert(not revalidation.data)
+
+        with app.app_context():
+            db.session.delete(Plant.query.filter_by(id=big_id).first())
+            db.session.commit()
+
     def test_plant_by_id_patch_route_updates_is_in_stock(self):
         '''returns JSON representing updated Plant object with "is_in_stock" = False at "/plants/<int:id>".'''
         with app.app_context():
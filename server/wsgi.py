@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""Production WSGI entry point.
+
+The `app.run(...)` block in app.py is the single-threaded Werkzeug dev
+server; in production run Gunicorn with gevent workers instead so
+independent requests run concurrently on green threads and DB I/O
+overlaps with JSON serialization:
+
+    gunicorn -k gevent -w 4 --worker-connections 1000 -b :5555 wsgi:application
+
+gevent has to monkey-patch the stdlib before anything else touches
+sockets, so this import must stay first.
+"""
+from gevent import monkey
+
+monkey.patch_all()
+
+from app import app as application  # noqa: E402